@@ -1,17 +1,17 @@
 """Hermod CLI - AI usage collection tool."""
 
-import json
 import logging
 import os
-import re
+import string
 import subprocess  # nosec B404 - Legitimate CLI integration with validation
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, NoReturn, Optional, Union
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
+from hermod import serialization
 from hermod.__version__ import __version__
 from hermod.collector import (
     DEFAULT_COMMAND_TIMEOUT_SECONDS,
@@ -24,11 +24,6 @@ from hermod.dependencies import check_all_dependencies
 from hermod.git_detector import detect_developer
 from hermod.logging_config import setup_logging
 
-# Initialize logging
-log_level = os.getenv("HERMOD_LOG_LEVEL", "WARNING")
-log_file = os.getenv("HERMOD_LOG_FILE")
-setup_logging(level=log_level, log_file=Path(log_file) if log_file else None)
-
 logger = logging.getLogger(__name__)
 
 app = typer.Typer(
@@ -38,16 +33,114 @@ app = typer.Typer(
 )
 console = Console()
 
+# gh subprocess runner; a module-level hook tests can swap with a fake
+_run = subprocess.run
+
 # Input validation constants
 DEVELOPER_NAME_MIN_LENGTH = 1
 DEVELOPER_NAME_MAX_LENGTH = 100
 DAYS_MIN = 1
 DAYS_MAX = 365
 
-# Input validation patterns
-DEVELOPER_NAME_PATTERN = re.compile(
-    rf"^[a-zA-Z0-9\s_-]{{{DEVELOPER_NAME_MIN_LENGTH},{DEVELOPER_NAME_MAX_LENGTH}}}$"
-)
+# Characters permitted in developer names
+DEVELOPER_NAME_ALLOWED_CHARS = string.ascii_letters + string.digits + " _-"
+
+# Translation table that deletes every allowed character
+_DEVELOPER_NAME_STRIP_TABLE = str.maketrans("", "", DEVELOPER_NAME_ALLOWED_CHARS)
+
+
+def _is_valid_developer_name(name: str) -> bool:
+    """Check name length and that it only contains allowed characters."""
+    if not DEVELOPER_NAME_MIN_LENGTH <= len(name) <= DEVELOPER_NAME_MAX_LENGTH:
+        return False
+    return not name.translate(_DEVELOPER_NAME_STRIP_TABLE)
+
+
+def _emit_json(payload: Dict[str, Any], indent: bool = False) -> None:
+    """Write a --json payload straight to stdout, bypassing Rich rendering."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(serialization.dumps(payload, indent=indent) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _fail(message: str, json_output: bool, code: int = 1) -> NoReturn:
+    """Report an error in the active output mode and exit."""
+    if json_output:
+        _emit_json({"error": message})
+    else:
+        console.print(f"[red]Error:[/red] {message}")
+    raise typer.Exit(code=code) from None
+
+
+def _decode_output(output: Union[bytes, str]) -> str:
+    """Decode captured subprocess output to text."""
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output
+
+
+def _describe_timeout_source(command_timeout_seconds: Optional[int]) -> Optional[str]:
+    """Describe where a non-default command timeout came from.
+
+    Args:
+        command_timeout_seconds: Timeout passed with --timeout, if any
+
+    Returns:
+        Rich markup naming the override, or None when the default timeout applies
+    """
+    if command_timeout_seconds:
+        return f"[blue]Command timeout override:[/blue] {command_timeout_seconds}s"
+    env_timeout = os.getenv("HERMOD_COMMAND_TIMEOUT_SECONDS")
+    if env_timeout:
+        return f"[blue]Command timeout source:[/blue] HERMOD_COMMAND_TIMEOUT_SECONDS={env_timeout}"
+    return None
+
+
+def _gh_is_authenticated() -> bool:
+    """Check whether gh CLI has an authenticated account.
+
+    Returns:
+        False if gh reports no authenticated account, True otherwise
+        (including when the check itself times out)
+    """
+    try:
+        result = _run(
+            ["gh", "auth", "status"],
+            capture_output=True,
+            check=False,
+            timeout=10,
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("GitHub CLI authentication check timed out")
+        return True
+    return result.returncode == 0
+
+
+def _find_latest_submission(submission_dir: Path) -> Optional[Path]:
+    """Find the most recently modified submission file.
+
+    Args:
+        submission_dir: Directory containing ai_usage_*.json files
+
+    Returns:
+        Path to the newest submission file, or None if there are none
+    """
+    try:
+        with os.scandir(submission_dir) as entries:
+            candidates = [
+                entry
+                for entry in entries
+                if entry.name.startswith("ai_usage_")
+                and entry.name.endswith(".json")
+                and entry.is_file()
+            ]
+    except OSError:
+        # Missing, not a directory, or unreadable: there is nothing to submit
+        return None
+
+    if not candidates:
+        return None
+    return Path(max(candidates, key=lambda entry: entry.stat().st_mtime).path)
 
 
 def version_callback(value: bool) -> None:
@@ -69,7 +162,12 @@ def main(
     ),
 ) -> None:
     """Hermod - AI usage collection tool."""
-    pass
+    # Configured here rather than at import so --help/--version stay fast
+    log_file = os.getenv("HERMOD_LOG_FILE")
+    setup_logging(
+        level=os.getenv("HERMOD_LOG_LEVEL", "WARNING"),
+        log_file=Path(log_file) if log_file else None,
+    )
 
 
 @app.command()
@@ -109,26 +207,20 @@ def collect(
     """Collect AI usage data from ccusage and ccusage-codex."""
     # Validate developer name if provided
     if developer is not None:
-        if not DEVELOPER_NAME_PATTERN.match(developer):
-            error_msg = (
+        if not _is_valid_developer_name(developer):
+            _fail(
                 f"Invalid developer name. Must be "
                 f"{DEVELOPER_NAME_MIN_LENGTH}-{DEVELOPER_NAME_MAX_LENGTH} "
-                "characters and contain only letters, numbers, spaces, underscores, and hyphens."
+                "characters and contain only letters, numbers, spaces, underscores, and hyphens.",
+                json_output,
             )
-            if json_output:
-                console.print(json.dumps({"error": error_msg}))
-            else:
-                console.print(f"[red]Error:[/red] {error_msg}")
-            raise typer.Exit(code=1)
 
     # Check dependencies
     deps = check_all_dependencies()
     if not all(deps.values()):
         missing = [tool for tool, installed in deps.items() if not installed]
         if json_output:
-            console.print(
-                json.dumps({"error": f"Dependencies not installed: {', '.join(missing)}"})
-            )
+            _emit_json({"error": f"Dependencies not installed: {', '.join(missing)}"})
         else:
             console.print("[red]Error:[/red] The following dependencies are not installed:")
             for tool in missing:
@@ -144,23 +236,15 @@ def collect(
         try:
             developer = detect_developer()
         except Exception as e:
-            if json_output:
-                console.print(json.dumps({"error": f"Failed to detect developer: {e}"}))
-            else:
-                console.print(f"[red]Error:[/red] Failed to detect developer: {e}")
-            raise typer.Exit(code=1) from None
+            _fail(f"Failed to detect developer: {e}", json_output)
 
         # Validate auto-detected name as well
-        if not DEVELOPER_NAME_PATTERN.match(developer):
-            error_msg = (
+        if not _is_valid_developer_name(developer):
+            _fail(
                 f"Auto-detected developer name '{developer}' is invalid. "
-                "Please provide a valid name with --developer option."
+                "Please provide a valid name with --developer option.",
+                json_output,
             )
-            if json_output:
-                console.print(json.dumps({"error": error_msg}))
-            else:
-                console.print(f"[red]Error:[/red] {error_msg}")
-            raise typer.Exit(code=1)
 
     # Collect usage data
     if not json_output:
@@ -173,21 +257,13 @@ def collect(
             command_timeout_seconds=command_timeout_seconds,
         )
     except Exception as e:
-        if json_output:
-            console.print(json.dumps({"error": f"Failed to collect usage data: {e}"}))
-        else:
-            console.print(f"[red]Error:[/red] Failed to collect usage data: {e}")
-        raise typer.Exit(code=1) from None
+        _fail(f"Failed to collect usage data: {e}", json_output)
 
     # Save submission
     try:
         output_file = save_submission(data, developer)
     except Exception as e:
-        if json_output:
-            console.print(json.dumps({"error": f"Failed to save submission: {e}"}))
-        else:
-            console.print(f"[red]Error:[/red] Failed to save submission: {e}")
-        raise typer.Exit(code=1) from None
+        _fail(f"Failed to save submission: {e}", json_output)
 
     # Output results
     if json_output:
@@ -199,7 +275,8 @@ def collect(
             "claude_code": data.get("claude_code", {}),
             "codex": data.get("codex", {}),
         }
-        console.print(json.dumps(output_data, indent=2))
+        # Indent for humans at a terminal; keep piped output compact
+        _emit_json(output_data, indent=sys.stdout.isatty())
     else:
         console.print(f"[green]✓[/green] Successfully collected usage data for {developer}")
         console.print(
@@ -207,18 +284,9 @@ def collect(
             f"{data['metadata']['date_range']['end']}"
         )
         console.print(f"[blue]Output file:[/blue] {output_file}")
-        if command_timeout_seconds:
-            console.print(f"[blue]Command timeout override:[/blue] {command_timeout_seconds}s")
-        elif os.getenv("HERMOD_COMMAND_TIMEOUT_SECONDS"):
-            console.print(
-                f"[blue]Command timeout source:[/blue] HERMOD_COMMAND_TIMEOUT_SECONDS="
-                f"{os.getenv('HERMOD_COMMAND_TIMEOUT_SECONDS')}"
-            )
-
-        # Show summary table
-        table = Table(title="Usage Summary")
-        table.add_column("Tool", style="cyan")
-        table.add_column("Total Cost", style="green")
+        timeout_source = _describe_timeout_source(command_timeout_seconds)
+        if timeout_source:
+            console.print(timeout_source)
 
         claude_total = data.get("claude_code", {}).get("totals", {}).get("totalCost", 0)
         codex_totals = data.get("codex", {}).get("totals") or {}
@@ -226,9 +294,36 @@ def collect(
         if codex_total is None:
             codex_total = codex_totals.get("costUSD", 0)
 
-        table.add_row("Claude Code", f"${claude_total:.2f}" if claude_total else "N/A")
-        table.add_row("Codex", f"${codex_total:.2f}" if codex_total else "N/A")
-        table.add_row("Total", f"${claude_total + codex_total:.2f}", style="bold")
+        if not (claude_total or codex_total):
+            # run_command returns {} when a tool fails, so an empty section is a
+            # failed collection rather than a quiet date range
+            failed = [
+                tool
+                for tool, key in (("Claude Code", "claude_code"), ("Codex", "codex"))
+                if not data.get(key)
+            ]
+            if failed:
+                console.print(
+                    f"[yellow]Could not collect usage from {' or '.join(failed)}; "
+                    "see the warnings above[/yellow]"
+                )
+            else:
+                console.print("[yellow]No usage recorded for this date range[/yellow]")
+            return
+
+        from rich.table import Table
+
+        claude_cost = f"${claude_total:.2f}" if claude_total else "N/A"
+        codex_cost = f"${codex_total:.2f}" if codex_total else "N/A"
+        total_cost = f"${claude_total + codex_total:.2f}"
+
+        # Show summary table
+        table = Table(title="Usage Summary")
+        table.add_column("Tool", style="cyan")
+        table.add_column("Total Cost", style="green")
+        table.add_row("Claude Code", claude_cost)
+        table.add_row("Codex", codex_cost)
+        table.add_row("Total", total_cost, style="bold")
 
         console.print(table)
 
@@ -244,10 +339,11 @@ def submit(
     """Submit AI usage data to GitHub Actions workflow.
 
     This command:
-    1. Checks that gh CLI is installed and authenticated
+    1. Checks that gh CLI is installed
     2. Finds the most recent submission file
     3. Base64 encodes the submission data
-    4. Triggers the ai-usage-ingestion GitHub Actions workflow
+    4. Triggers the ai-usage-ingestion GitHub Actions workflow, checking gh
+       authentication only if the trigger fails
     5. Cleans up the submission file after successful submission
     """
     import base64
@@ -266,59 +362,37 @@ def submit(
         console.print("   Install with: brew install gh")
         raise typer.Exit(code=1)
 
-    # Check gh is authenticated
-    try:
-        result = subprocess.run(
-            ["gh", "auth", "status"],
-            capture_output=True,
-            check=False,
-            timeout=10,
-        )
-        if result.returncode != 0:
-            console.print("[red]❌ GitHub CLI is not authenticated[/red]")
-            console.print("   Run: gh auth login")
-            raise typer.Exit(code=1)
-    except subprocess.TimeoutExpired:
-        console.print("[red]❌ GitHub CLI authentication check timed out[/red]")
-        raise typer.Exit(code=1) from None
-
     # Find most recent submission file
     console.print("[blue]📊 Finding submission file...[/blue]")
 
-    submission_files = sorted(
-        submission_dir.glob("ai_usage_*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+    submission_file = _find_latest_submission(submission_dir)
 
-    if not submission_files:
+    if submission_file is None:
         console.print("[red]❌ No submission file found[/red]")
         console.print(f"   Expected files matching: {submission_dir}/ai_usage_*.json")
         console.print("   Run 'hermod collect' first to generate submission data")
         raise typer.Exit(code=1)
 
-    submission_file = submission_files[0]
     console.print(f"[green]✓[/green] Found: {submission_file}")
 
-    # Load and extract developer name
+    # Load and extract developer name (the raw bytes are reused for encoding)
+    raw = submission_file.read_bytes()
     try:
-        with open(submission_file, "r") as f:
-            data = json.load(f)
+        data = serialization.loads(raw)
         developer = data["metadata"]["developer"]
-    except (json.JSONDecodeError, KeyError) as e:
+    except (serialization.JSONDecodeError, KeyError) as e:
         console.print(f"[red]❌ Invalid submission file format: {e}[/red]")
         raise typer.Exit(code=1) from None
 
     # Base64 encode the data
     console.print("[blue]🔐 Encoding submission data...[/blue]")
-    with open(submission_file, "rb") as f:
-        data_b64 = base64.b64encode(f.read()).decode("utf-8")
+    data_b64 = base64.b64encode(raw)
 
     # Trigger GitHub Actions workflow
     console.print("[blue]🚀 Submitting to GitHub Actions...[/blue]")
 
     try:
-        result = subprocess.run(
+        result = _run(
             [
                 "gh",
                 "workflow",
@@ -326,20 +400,26 @@ def submit(
                 "ai-usage-ingestion.yml",
                 "-f",
                 f"developer={developer}",
-                "-f",
-                f"data_base64={data_b64}",
+                # Read from stdin: argv is capped at 128 KiB per argument on Linux,
+                # which large submissions exceed once base64 encoded
+                "-F",
+                "data_base64=@-",
             ],
+            input=data_b64,
             capture_output=True,
             check=False,
             timeout=30,
         )
 
         if result.returncode != 0:
+            # Authentication is only diagnosed after a failed trigger, which saves
+            # a gh process spawn on every successful submission
+            if not _gh_is_authenticated():
+                console.print("[red]❌ GitHub CLI is not authenticated[/red]")
+                console.print("   Run: gh auth login")
+                raise typer.Exit(code=1)
             console.print("[red]❌ Failed to submit to GitHub Actions[/red]")
-            error_msg = (
-                result.stderr.decode() if isinstance(result.stderr, bytes) else result.stderr
-            )
-            console.print(f"   Error: {error_msg}")
+            console.print(f"   Error: {_decode_output(result.stderr)}")
             raise typer.Exit(code=1)
 
     except subprocess.TimeoutExpired:
@@ -348,16 +428,13 @@ def submit(
 
     # Get repository info for the success message
     try:
-        result = subprocess.run(
+        result = _run(
             ["gh", "repo", "view", "--json", "nameWithOwner", "-q", ".nameWithOwner"],
             capture_output=True,
             check=True,
             timeout=10,
         )
-        repo_name_bytes = (
-            result.stdout.decode() if isinstance(result.stdout, bytes) else result.stdout
-        )
-        repo_name = repo_name_bytes.strip()
+        repo_name = _decode_output(result.stdout).strip()
         actions_url = f"https://github.com/{repo_name}/actions"
     except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         actions_url = "GitHub Actions"
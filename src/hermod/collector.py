@@ -1,17 +1,28 @@
 """AI usage data collection from ccusage and ccusage-codex."""
 
-import json
+import atexit
+import functools
 import logging
 import os
 import subprocess  # nosec B404 - Legitimate CLI integration with validation
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from hermod import serialization
+
 logger = logging.getLogger(__name__)
 
-# Allowed commands for security
-ALLOWED_COMMANDS = {"ccusage", "ccusage-codex"}
+# Allowed commands for security (immutable so the allowlist cannot be widened at runtime)
+ALLOWED_COMMANDS = frozenset({"ccusage", "ccusage-codex"})
+
+# Shell metacharacters rejected in command arguments, as a deletion table so
+# each argument is scanned in a single C-level pass
+DANGEROUS_ARG_CHARS = ";|&$`()<>\n\r"
+_DANGEROUS_ARG_TABLE = str.maketrans("", "", DANGEROUS_ARG_CHARS)
 
 # Command execution timeout configuration (seconds)
 DEFAULT_COMMAND_TIMEOUT_SECONDS = 60
@@ -21,6 +32,10 @@ MAX_COMMAND_TIMEOUT_SECONDS = 900
 # Default output directory (configurable via environment variable)
 DEFAULT_OUTPUT_DIR = Path(os.getenv("HERMOD_OUTPUT_DIR", "data/ai_usage/submissions"))
 
+# Worker pool shared by collect_usage calls, created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
 
 def _validate_timeout(value: int) -> int:
     """Validate timeout bounds."""
@@ -37,7 +52,22 @@ def resolve_command_timeout_seconds(explicit_timeout: Optional[int] = None) -> i
     if explicit_timeout is not None:
         return _validate_timeout(explicit_timeout)
 
-    env_value = os.getenv("HERMOD_COMMAND_TIMEOUT_SECONDS")
+    return _resolve_env_timeout(os.getenv("HERMOD_COMMAND_TIMEOUT_SECONDS"))
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_env_timeout(env_value: Optional[str]) -> int:
+    """Parse and validate a HERMOD_COMMAND_TIMEOUT_SECONDS value.
+
+    Cached on the raw string, so a changed environment is still picked up and
+    an invalid value is only reported once.
+
+    Args:
+        env_value: Raw environment variable value, or None if unset
+
+    Returns:
+        The configured timeout, or the default if unset or invalid
+    """
     if env_value:
         try:
             return _validate_timeout(int(env_value))
@@ -52,6 +82,20 @@ def resolve_command_timeout_seconds(explicit_timeout: Optional[int] = None) -> i
     return DEFAULT_COMMAND_TIMEOUT_SECONDS
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared collection pool, starting it on first use.
+
+    The pool lives for the rest of the process so repeated collections reuse its
+    threads; it is shut down at interpreter exit.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hermod-collect")
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
 def run_command(cmd: list[str], timeout_seconds: Optional[int] = None) -> Dict[str, Any]:
     """Run command and return parsed JSON output with security validation.
 
@@ -70,18 +114,19 @@ def run_command(cmd: list[str], timeout_seconds: Optional[int] = None) -> Dict[s
         raise ValueError(f"Command not allowed: {cmd[0] if cmd else 'empty'}")
 
     # Validate arguments don't contain shell injection characters
-    dangerous_chars = {";", "|", "&", "$", "`", "(", ")", "<", ">", "\n", "\r"}
     for arg in cmd[1:]:
-        if any(char in arg for char in dangerous_chars):
+        if len(arg.translate(_DANGEROUS_ARG_TABLE)) != len(arg):
             raise ValueError(f"Invalid argument contains dangerous characters: {arg}")
 
     timeout = resolve_command_timeout_seconds(timeout_seconds)
 
+    # No preexec_fn or user/group switching: that keeps CPython on its vfork()
+    # spawn path instead of a full fork() of the interpreter
     try:
         result = subprocess.run(  # nosec B603 - Command validated against allowlist
-            cmd, capture_output=True, text=True, check=True, timeout=timeout
+            cmd, capture_output=True, check=True, timeout=timeout
         )
-        data = json.loads(result.stdout)
+        data = serialization.loads(result.stdout)
 
         # Validate output structure is a dictionary
         if not isinstance(data, dict):
@@ -90,16 +135,16 @@ def run_command(cmd: list[str], timeout_seconds: Optional[int] = None) -> Dict[s
         return data
 
     except subprocess.TimeoutExpired:
-        logger.error(f"Command timeout after {timeout}s: {cmd[0]}")
+        logger.error("Command timeout after %ss: %s", timeout, cmd[0])
         return {}
     except subprocess.CalledProcessError as e:
-        logger.warning(f"Command failed: {cmd[0]}: {e}")
+        logger.warning("Command failed: %s: %s", cmd[0], e)
         return {}
-    except json.JSONDecodeError as e:
-        logger.warning(f"Invalid JSON from {cmd[0]}: {e}")
+    except serialization.JSONDecodeError as e:
+        logger.warning("Invalid JSON from %s: %s", cmd[0], e)
         return {}
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise
 
 
@@ -130,23 +175,25 @@ def collect_usage(
     start_date = end_date - timedelta(days=days)
     since_str = start_date.strftime("%Y%m%d")
 
-    # Collect Claude Code usage
-    claude_data = run_command(
-        ["ccusage", "daily", "--json", "--since", since_str],
-        timeout_seconds=command_timeout_seconds,
-    )
+    # Submission key for each tool's output
+    commands = {
+        "claude_code": ["ccusage", "daily", "--json", "--since", since_str],
+        "codex": ["ccusage-codex", "daily", "--json", "--since", since_str],
+    }
 
-    # Collect Codex usage
-    codex_data = run_command(
-        ["ccusage-codex", "daily", "--json", "--since", since_str],
-        timeout_seconds=command_timeout_seconds,
-    )
+    # Run the tools concurrently; each spends its time waiting on a subprocess
+    executor = _get_executor()
+    futures = {
+        key: executor.submit(run_command, cmd, command_timeout_seconds)
+        for key, cmd in commands.items()
+    }
+    results = {key: future.result() for key, future in futures.items()}
 
     # Combine with metadata
     return {
         "metadata": {
             "developer": developer,
-            "collected_at": datetime.now().isoformat(),
+            "collected_at": end_date.isoformat(),
             "date_range": {
                 "start": start_date.date().isoformat(),
                 "end": end_date.date().isoformat(),
@@ -154,8 +201,7 @@ def collect_usage(
             },
             "version": "1.0",
         },
-        "claude_code": claude_data,
-        "codex": codex_data,
+        **results,
     }
 
 
@@ -186,10 +232,21 @@ def save_submission(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    date_str = datetime.now().strftime("%Y%m%d")
+    date_str = timestamp[:8]
     output_file = output_dir / f"ai_usage_{developer}_{date_str}_{timestamp}.json"
 
-    with open(output_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # Write to a uniquely named sibling temp file and rename it into place, so
+    # readers such as `hermod submit` never see a partially written submission,
+    # even when two collections save in the same second
+    payload = serialization.dumps(data, indent=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix=output_file.name, suffix=".tmp")
+    tmp_file = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
 
     return output_file
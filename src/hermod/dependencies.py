@@ -1,12 +1,15 @@
 """External dependency checking for ccusage tools."""
 
+import functools
 import logging
 import shutil
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def check_ccusage_installed() -> bool:
     """Check if ccusage is installed and available on PATH.
 
@@ -19,6 +22,7 @@ def check_ccusage_installed() -> bool:
     return installed
 
 
+@functools.lru_cache(maxsize=1)
 def check_ccusage_codex_installed() -> bool:
     """Check if ccusage-codex is installed and available on PATH.
 
@@ -31,15 +35,18 @@ def check_ccusage_codex_installed() -> bool:
     return installed
 
 
-def check_all_dependencies() -> Dict[str, bool]:
+@functools.lru_cache(maxsize=1)
+def check_all_dependencies() -> Mapping[str, bool]:
     """Check all required external dependencies.
 
+    The result is cached for the process lifetime; call ``cache_clear()`` to re-check.
+
     Returns:
-        Dictionary mapping tool name to installed status
+        Read-only mapping of tool name to installed status
 
     Example:
         >>> deps = check_all_dependencies()
-        >>> print(deps)
+        >>> print(dict(deps))
         {'ccusage': True, 'ccusage-codex': True}
         >>> all(deps.values())
         True
@@ -48,8 +55,8 @@ def check_all_dependencies() -> Dict[str, bool]:
 
     missing = [tool for tool, installed in deps.items() if not installed]
     if missing:
-        logger.error(f"Missing dependencies: {', '.join(missing)}")
+        logger.error("Missing dependencies: %s", ", ".join(missing))
     else:
         logger.debug("All dependencies installed")
 
-    return deps
+    return MappingProxyType(deps)
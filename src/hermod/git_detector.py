@@ -1,106 +1,307 @@
 """Git configuration detection for developer identification."""
 
-import json
+import configparser
+import functools
 import logging
+import os
+import re
 import subprocess  # nosec B404 - Legitimate git CLI integration
+import sys
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
+from hermod import serialization
+
 logger = logging.getLogger(__name__)
 
 # Git command timeout in seconds
 GIT_COMMAND_TIMEOUT_SECONDS = 5
 
+# Environment variables git needs to locate its config; everything else is
+# dropped so the child process is spawned with a small environment
+_GIT_ENV_VARS = (
+    "PATH",
+    "HOME",
+    "XDG_CONFIG_HOME",
+    "USERPROFILE",
+    "HOMEDRIVE",
+    "HOMEPATH",
+    "SYSTEMROOT",
+)
 
-def get_git_user_email() -> str:
-    """Get user email from git config.
+# Developer name mappings, kept in the repository's config directory
+_CONFIG_PATH = Path(__file__).parents[2] / "config" / "developer_names.json"
+
+# Email usernames accepted as a fallback developer name
+_FALLBACK_NAME_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]+")
+
+# Characters whose git config semantics configparser does not reproduce
+_GIT_CONFIG_SYNTAX_CHARS = '"\\#;'
+
+# Identity read directly from git config files, cached for the process lifetime
+_git_identity: Optional[dict[str, str]] = None
+
+# Identity read through the git CLI when config files are not enough
+_git_cli_identity: Optional[dict[str, str]] = None
+
+# Mappings returned when there is no developer names config
+_EMPTY_MAPPINGS: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {"email_to_canonical": MappingProxyType({}), "name_to_canonical": MappingProxyType({})}
+)
+
+
+def _git_config_files() -> Optional[list[Path]]:
+    """List the git config files that can define user identity.
 
     Returns:
-        Email address from git config
+        Config file paths in increasing precedence order, or None when git would
+        consult sources this reader does not model (environment overrides, a
+        relocated GIT_DIR, or a worktree/submodule .git file)
+    """
+    if os.getenv("GIT_CONFIG_PARAMETERS") or os.getenv("GIT_CONFIG_COUNT") or os.getenv("GIT_DIR"):
+        return None
 
-    Raises:
-        RuntimeError: If git email is not configured
+    global_config = os.getenv("GIT_CONFIG_GLOBAL")
+    if global_config:
+        files = [Path(global_config)]
+    else:
+        xdg_config_home = os.getenv("XDG_CONFIG_HOME")
+        xdg_dir = Path(xdg_config_home) if xdg_config_home else Path.home() / ".config"
+        files = [xdg_dir / "git" / "config", Path.home() / ".gitconfig"]
+
+    cwd = Path.cwd()
+    for directory in (cwd, *cwd.parents):
+        git_dir = directory / ".git"
+        if git_dir.is_dir():
+            files.append(git_dir / "config")
+            break
+        if git_dir.exists():
+            return None
+
+    return files
+
+
+def _git_env() -> dict[str, str]:
+    """Build the minimal environment for git subprocesses.
+
+    Returns:
+        The variables in _GIT_ENV_VARS plus any GIT_* overrides that are set
     """
-    try:
-        result = subprocess.run(  # nosec B603, B607 - Controlled git CLI execution
-            ["git", "config", "user.email"], capture_output=True, text=True, check=True
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key in _GIT_ENV_VARS or key.startswith("GIT_")
+    }
+
+
+def _read_git_identity() -> dict[str, str]:
+    """Read user.email and user.name from git config files without spawning git.
+
+    Returns:
+        The identity fields found ("email", "name"). Fields that are missing, or
+        every field when a config file uses includes, has a [DEFAULT], user
+        subsection or repeated [user] section, quotes or comments a user value,
+        or cannot be parsed, are left out so callers fall back to `git config`.
+    """
+    global _git_identity
+    if _git_identity is not None:
+        return _git_identity
+
+    identity: dict[str, str] = {}
+    for config_file in _git_config_files() or []:
+        # No header can contain NUL, so [DEFAULT] is read as an ordinary section
+        # instead of leaking its keys into [user]
+        parser = configparser.ConfigParser(
+            strict=False, allow_no_value=True, interpolation=None, default_section="\0"
         )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
-        raise RuntimeError(
-            "Git user.email not configured. Run: git config --global user.email 'you@example.com'"
-        ) from None
+        try:
+            parser.read_string(config_file.read_text(), source=str(config_file))
+        except FileNotFoundError:
+            continue
+        except (OSError, UnicodeDecodeError, configparser.Error) as e:
+            logger.debug("Could not parse %s: %s. Falling back to git CLI.", config_file, e)
+            identity = {}
+            break
 
+        headers = [section.lower() for section in parser.sections()]
+        section_names = {header.split()[0] for header in headers if header.split()}
+        if "include" in section_names or "includeif" in section_names:
+            logger.debug("%s uses includes. Falling back to git CLI.", config_file)
+            identity = {}
+            break
 
-def get_git_user_name() -> Optional[str]:
-    """Get user name from git config.
+        # configparser merges [DEFAULT], [user "sub"] and [User]/[user] repeats
+        # differently from git, so only a single plain [user] section is read
+        user_headers = [header for header in headers if header.split()[:1] == ["user"]]
+        if "default" in headers or user_headers not in ([], ["user"]):
+            logger.debug("%s has ambiguous user sections. Falling back to git CLI.", config_file)
+            identity = {}
+            break
+
+        if user_headers:
+            user = parser[parser.sections()[headers.index("user")]]
+            values = {field: user.get(field) or "" for field in ("email", "name")}
+            # Quoting, escapes, continuations and inline comments need git's parser
+            if any(char in value for value in values.values() for char in _GIT_CONFIG_SYNTAX_CHARS):
+                logger.debug(
+                    "%s quotes or comments user values. Falling back to git CLI.", config_file
+                )
+                identity = {}
+                break
+            # Like git, collapse unquoted whitespace runs to a single space
+            identity.update(
+                (field, " ".join(value.split())) for field, value in values.items() if value
+            )
+
+    _git_identity = identity
+    return identity
+
+
+def _get_git_user_fields() -> dict[str, str]:
+    """Read user.email and user.name with a single `git config` invocation.
+
+    Successful reads are cached for the process lifetime.
 
     Returns:
-        User name from git config, or None if not configured
+        The identity fields that are set ("email", "name"); empty if git fails
     """
+    global _git_cli_identity
+    if _git_cli_identity is not None:
+        return _git_cli_identity
+
     try:
         result = subprocess.run(  # nosec B603, B607 - Controlled git CLI execution
-            ["git", "config", "user.name"],
+            ["git", "config", "-z", "--get-regexp", r"^user\.(email|name)$"],
             capture_output=True,
             text=True,
             check=True,
             timeout=GIT_COMMAND_TIMEOUT_SECONDS,
+            env=_git_env(),
         )
-        return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        logger.debug(f"Git user.name not configured: {e}")
-        return None
+        # Exit status 1 means neither key is set
+        logger.debug("Git config could not be read: %s", e)
+        return {}
     except subprocess.TimeoutExpired:
-        logger.warning("Git command timeout when fetching user.name")
-        return None
+        logger.warning("Git command timeout when fetching user config")
+        return {}
     except FileNotFoundError:
         logger.error("Git not found in PATH")
-        return None
+        return {}
 
+    # Records are "key\nvalue" separated by NUL; later (higher precedence) entries win
+    fields: dict[str, str] = {}
+    for record in result.stdout.split("\0"):
+        key, _, value = record.partition("\n")
+        if key in ("user.email", "user.name"):
+            fields[key.removeprefix("user.")] = value.strip()
 
-def load_developer_mappings() -> dict[str, dict[str, str]]:
-    """Load developer name mappings from config file.
+    _git_cli_identity = fields
+    return fields
+
+
+def _get_git_user_field(field: str) -> Optional[str]:
+    """Look up a user.* field from config files, falling back to the git CLI."""
+    return _read_git_identity().get(field) or _get_git_user_fields().get(field) or None
+
+
+def get_git_user_email() -> str:
+    """Get user email from git config.
+
+    Returns:
+        Email address from git config
+
+    Raises:
+        RuntimeError: If git email is not configured
+    """
+    email = _get_git_user_field("email")
+    if email is None:
+        raise RuntimeError(
+            "Git user.email not configured. Run: git config --global user.email 'you@example.com'"
+        )
+    return email
+
+
+def get_git_user_name() -> Optional[str]:
+    """Get user name from git config.
 
     Returns:
-        Dictionary with email_to_name and name_to_canonical mappings.
-        Returns empty mappings if config file doesn't exist.
+        User name from git config, or None if not configured
     """
-    config_path = Path(__file__).parent.parent.parent / "config" / "developer_names.json"
+    return _get_git_user_field("name")
 
+
+def load_developer_mappings() -> Mapping[str, Mapping[str, str]]:
+    """Load developer name mappings from config file.
+
+    Returns:
+        Read-only mapping with email_to_canonical and name_to_canonical lookups,
+        keyed by lowercase email/name. Returns empty mappings if config file
+        doesn't exist.
+    """
     # Return empty mappings if config file doesn't exist
-    if not config_path.exists():
-        logger.debug(f"Config file not found: {config_path}. Using empty mappings.")
-        return {"email_to_canonical": {}, "name_to_canonical": {}}
+    try:
+        mtime_ns = _CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        logger.debug("Config file not found: %s. Using empty mappings.", _CONFIG_PATH)
+        return _EMPTY_MAPPINGS
+
+    # Keyed on mtime so edits to the config file invalidate the cached mappings
+    return _load_developer_mappings_cached(str(_CONFIG_PATH), mtime_ns)
 
-    with open(config_path) as f:
-        config = json.load(f)
 
-    # Build lookup maps
-    email_to_canonical = {}
-    name_to_canonical = {}
+@functools.lru_cache(maxsize=4)
+def _load_developer_mappings_cached(
+    config_path: str, mtime_ns: int
+) -> Mapping[str, Mapping[str, str]]:
+    """Parse the developer names config and build lookup maps.
 
-    for dev in config["developers"]:
-        canonical = dev["canonical_name"]
+    The result is shared by every caller, so it is frozen. Keys and names are
+    interned since they live for the rest of the process.
 
-        # Map git emails (primary source)
-        for git_email in dev.get("git_emails", []):
-            email_to_canonical[git_email.lower()] = canonical
+    Args:
+        config_path: Path to developer_names.json
+        mtime_ns: Modification time of the file, used only as a cache key
+
+    Returns:
+        Read-only mapping with email_to_canonical and name_to_canonical lookups
+    """
+    developers = serialization.loads(Path(config_path).read_bytes())["developers"]
 
-        # Map linear emails (many contain email addresses)
-        for linear_name in dev.get("linear_names", []):
-            if "@" in linear_name:
-                email_to_canonical[linear_name.lower()] = canonical
+    # Map git emails (primary source) and linear names that are email addresses
+    email_to_canonical = {
+        sys.intern(email.lower()): sys.intern(dev["canonical_name"])
+        for dev in developers
+        for email in (
+            *dev.get("git_emails", ()),
+            *(name for name in dev.get("linear_names", ()) if "@" in name),
+        )
+    }
 
-        # Map git names
-        for git_name in dev.get("git_names", []):
-            name_to_canonical[git_name.lower()] = canonical
+    # Map git names
+    name_to_canonical = {
+        sys.intern(git_name.lower()): sys.intern(dev["canonical_name"])
+        for dev in developers
+        for git_name in dev.get("git_names", ())
+    }
 
-    return {"email_to_canonical": email_to_canonical, "name_to_canonical": name_to_canonical}
+    return MappingProxyType(
+        {
+            "email_to_canonical": MappingProxyType(email_to_canonical),
+            "name_to_canonical": MappingProxyType(name_to_canonical),
+        }
+    )
 
 
+@functools.lru_cache(maxsize=1)
 def detect_developer() -> str:
     """Detect developer canonical name from git configuration.
 
+    The detected name is cached for the process lifetime (failures are not);
+    call ``detect_developer.cache_clear()`` to detect again.
+
     Returns:
         Canonical developer name
 
@@ -114,32 +315,36 @@ def detect_developer() -> str:
     """
     mappings = load_developer_mappings()
 
-    # Try email first (most reliable)
+    # Try email first (most reliable). Mapping keys are lowercase and most emails
+    # already are, so only normalize on a miss.
     email = get_git_user_email()
-    canonical = mappings["email_to_canonical"].get(email.lower())
+    email_to_canonical = mappings["email_to_canonical"]
+    canonical = email_to_canonical.get(email) or email_to_canonical.get(email.lower())
     if canonical:
-        logger.debug(f"Detected developer from email mapping: {canonical}")
+        logger.debug("Detected developer from email mapping: %s", canonical)
         return canonical
 
     # Try git name
     git_name = get_git_user_name()
     if git_name:
-        canonical = mappings["name_to_canonical"].get(git_name.lower())
+        name_to_canonical = mappings["name_to_canonical"]
+        canonical = name_to_canonical.get(git_name) or name_to_canonical.get(git_name.lower())
         if canonical:
-            logger.debug(f"Detected developer from name mapping: {canonical}")
+            logger.debug("Detected developer from name mapping: %s", canonical)
             return canonical
 
     # Fallback to email username - but validate it first
     if "@" in email:
         fallback = email.split("@")[0]
         # Validate fallback name is reasonable (letters, numbers, underscores, hyphens)
-        import re
-
-        if re.match(r"^[a-zA-Z][a-zA-Z0-9_-]+$", fallback):
+        if _FALLBACK_NAME_RE.fullmatch(fallback) is not None:
             logger.warning(
-                f"No mapping found in config/developer_names.json for email '{email}' "
-                f"or git name '{git_name}'. Using email username as fallback: {fallback}. "
-                f"Consider adding this developer to config/developer_names.json for proper mapping."
+                "No mapping found in config/developer_names.json for email '%s' "
+                "or git name '%s'. Using email username as fallback: %s. "
+                "Consider adding this developer to config/developer_names.json for proper mapping.",
+                email,
+                git_name,
+                fallback,
             )
             return fallback
 
@@ -1,10 +1,22 @@
 """Logging configuration for Hermod."""
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 from pathlib import Path
 from typing import Optional
 
+# Background listener that owns the file handler, if one is configured
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# (level, log_file, format_string) of the last applied configuration and the
+# root handlers it installed, used to skip redundant reconfiguration
+_applied_config: Optional[tuple[str, Optional[str], str]] = None
+_applied_handlers: list[logging.Handler] = []
+
 
 def setup_logging(
     level: str = "INFO", log_file: Optional[Path] = None, format_string: Optional[str] = None
@@ -23,14 +35,29 @@ def setup_logging(
         >>> logger = logging.getLogger("hermod")
         >>> logger.debug("Debug message")
     """
+    global _listener, _applied_config, _applied_handlers
     if format_string is None:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+    # Nothing to do if the same configuration is still installed
+    config = (level.upper(), str(log_file) if log_file else None, format_string)
+    root_logger = logging.getLogger()
+    if (
+        config == _applied_config
+        and root_logger.handlers == _applied_handlers
+        and (log_file is None or _listener is not None)
+    ):
+        return
+
     # Create formatter
     formatter = logging.Formatter(format_string)
 
+    # Keep the running file listener (and its open file) when only the level or
+    # format changes; otherwise stop it before replacing handlers
+    if log_file is None or os.path.abspath(log_file) != _listener_log_file():
+        shutdown_logging()
+
     # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
     # Remove existing handlers to avoid duplicates
@@ -42,18 +69,58 @@ def setup_logging(
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
 
-    # File handler if specified
+    # File handler if specified. Records are queued and written by a background
+    # listener so logging callers never block on file I/O. QueueHandler formats
+    # the message before enqueueing, so the file handler writes it as-is.
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        if _listener is None:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(log_file, delay=True)
+            log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(log_queue, file_handler)
+            _listener.start()
+        queue_handler = logging.handlers.QueueHandler(_listener.queue)
+        queue_handler.setLevel(logging.DEBUG)
+        queue_handler.setFormatter(formatter)
+        root_logger.addHandler(queue_handler)
 
     # Configure hermod logger specifically
     hermod_logger = logging.getLogger("hermod")
     hermod_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
+    _applied_config = config
+    _applied_handlers = list(root_logger.handlers)
+
+
+def _listener_log_file() -> Optional[str]:
+    """Absolute path of the file the running listener writes to, if any."""
+    if _listener is None:
+        return None
+    handler = _listener.handlers[0]
+    return handler.baseFilename if isinstance(handler, logging.FileHandler) else None
+
+
+@atexit.register
+def shutdown_logging() -> None:
+    """Flush queued log records to the log file and stop the background listener.
+
+    Registered to run at interpreter exit; safe to call more than once.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def _reset_logging() -> None:
+    """Forget the applied configuration so the next setup_logging call rebuilds it."""
+    global _applied_config
+    shutdown_logging()
+    _applied_config = None
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a module.
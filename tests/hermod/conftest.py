@@ -0,0 +1,63 @@
+"""Shared fixtures for Hermod tests.
+
+The suite relies on no third-party pytest plugins other than pytest-cov (for the
+--cov options in pyproject.toml), so CI runs it with PYTEST_DISABLE_PLUGIN_AUTOLOAD=1
+and ``-p pytest_cov``. Opt any new plugin in there as well.
+
+Tests must keep their state in fixtures (``monkeypatch``, ``tmp_path``) so the
+suite stays safe to run under ``pytest -n auto`` (pytest-xdist).
+"""
+
+import logging
+from collections.abc import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from hermod.logging_config import _reset_logging
+
+
+@pytest.fixture(scope="session")
+def app() -> typer.Typer:
+    """The Hermod Typer application."""
+    from hermod.cli import app as hermod_app
+
+    return hermod_app
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """CLI test runner, shared by every test in the session."""
+    return CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def mock_subprocess_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace ``subprocess.run`` so no test spawns a real process.
+
+    ``hermod.cli._run`` is bound to ``subprocess.run`` at import, so it is
+    swapped for the same mock. Request the fixture by name to configure the mock
+    or inspect its calls.
+    """
+    mock = MagicMock()
+    monkeypatch.setattr("subprocess.run", mock)
+    monkeypatch.setattr("hermod.cli._run", mock)
+    return mock
+
+
+@pytest.fixture(autouse=True)
+def restore_logging() -> Iterator[None]:
+    """Put the root and hermod loggers back as they were after each test."""
+    root = logging.getLogger()
+    hermod_logger = logging.getLogger("hermod")
+    saved = (root.handlers[:], root.level, hermod_logger.level)
+    yield
+    _reset_logging()
+    for handler in root.handlers:
+        if handler not in saved[0]:
+            handler.close()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+    hermod_logger.setLevel(saved[2])
@@ -1,7 +1,14 @@
 """Tests for AI usage data collection."""
 
+import json
+import os
 import subprocess
-from unittest.mock import MagicMock, patch
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -9,21 +16,38 @@ from hermod.collector import (
     DEFAULT_COMMAND_TIMEOUT_SECONDS,
     MAX_COMMAND_TIMEOUT_SECONDS,
     MIN_COMMAND_TIMEOUT_SECONDS,
+    _get_executor,
+    _resolve_env_timeout,
     collect_usage,
     resolve_command_timeout_seconds,
     run_command,
     save_submission,
 )
 
+# Canned tool output keyed by command; read-only so tests can share them
+_USAGE_RESPONSES = MappingProxyType(
+    {
+        "ccusage": MappingProxyType(
+            {"daily": ({"date": "2025-01-22", "cost": 1.50},), "totals": {"totalCost": 1.50}}
+        ),
+        "ccusage-codex": MappingProxyType(
+            {"daily": ({"date": "2025-01-22", "cost": 2.00},), "totals": {"totalCost": 2.00}}
+        ),
+    }
+)
+_PARTIAL_FAILURE_RESPONSES = MappingProxyType(
+    {
+        "ccusage": MappingProxyType({"daily": (), "totals": {}}),
+        "ccusage-codex": MappingProxyType({}),  # Empty dict indicates error
+    }
+)
+
 
 def test_collect_usage_success() -> None:
     """Test successful data collection."""
     with patch("hermod.collector.run_command") as mock_run:
-        # Mock ccusage response
-        mock_run.side_effect = [
-            {"daily": [{"date": "2025-01-22", "cost": 1.50}], "totals": {"totalCost": 1.50}},
-            {"daily": [{"date": "2025-01-22", "cost": 2.00}], "totals": {"totalCost": 2.00}},
-        ]
+        # Tools run concurrently, so key responses by command rather than call order
+        mock_run.side_effect = lambda cmd, *args, **kwargs: _USAGE_RESPONSES[cmd[0]]
 
         data = collect_usage("Chad", days=7)
 
@@ -33,28 +57,54 @@ def test_collect_usage_success() -> None:
         assert "codex" in data
         assert data["claude_code"]["totals"]["totalCost"] == 1.50
         assert data["codex"]["totals"]["totalCost"] == 2.00
+        assert data["metadata"]["collected_at"][:10] == data["metadata"]["date_range"]["end"]
+
+
+def test_collect_usage_passes_timeout_to_each_command() -> None:
+    """Test the timeout override reaches every concurrently run tool."""
+    with patch("hermod.collector.run_command", return_value={}) as mock_run:
+        collect_usage("Chad", days=7, command_timeout_seconds=120)
+
+    commands = sorted((call.args[0][0], call.args[1]) for call in mock_run.call_args_list)
+    assert commands == [("ccusage", 120), ("ccusage-codex", 120)]
+
+
+def test_collect_usage_reuses_worker_pool() -> None:
+    """Test repeated collections run on one shared, named thread pool."""
+    with patch("hermod.collector.run_command") as mock_run:
+        mock_run.side_effect = lambda *args, **kwargs: {"thread": threading.current_thread().name}
+        first = collect_usage("Chad", days=7)
+        executor = _get_executor()
+        workers = set(executor._threads)
+        second = collect_usage("Chad", days=7)
+
+    assert first["claude_code"]["thread"].startswith("hermod-collect")
+    assert _get_executor() is executor
+    # The second collection ran on the idle workers instead of starting new ones
+    assert executor._threads == workers
+    assert second["codex"]["thread"] in {thread.name for thread in workers}
 
 
 def test_collect_usage_handles_errors() -> None:
     """Test collection continues when one tool fails."""
     with patch("hermod.collector.run_command") as mock_run:
-        # First call succeeds, second fails
-        mock_run.side_effect = [
-            {"daily": [], "totals": {}},
-            {},  # Empty dict indicates error
-        ]
+        mock_run.side_effect = lambda cmd, *args, **kwargs: _PARTIAL_FAILURE_RESPONSES[cmd[0]]
 
         data = collect_usage("Chad", days=7)
 
-        assert data["claude_code"] == {"daily": [], "totals": {}}
+        assert data["claude_code"] == {"daily": (), "totals": {}}
         assert data["codex"] == {}
 
 
+def test_collect_usage_propagates_validation_errors() -> None:
+    """Test errors raised by a collector surface from collect_usage."""
+    with patch("hermod.collector.run_command", side_effect=ValueError("Command not allowed")):
+        with pytest.raises(ValueError, match="Command not allowed"):
+            collect_usage("Chad", days=7)
+
+
 def test_save_submission() -> None:
     """Test saving submission to file."""
-    import tempfile
-    from pathlib import Path
-
     test_data = {
         "metadata": {"developer": "Chad", "collected_at": "2025-01-22T10:00:00"},
         "claude_code": {},
@@ -66,16 +116,51 @@ def test_save_submission() -> None:
 
         assert output_path.exists()
         assert "ai_usage_Chad_" in output_path.name
+        _, date_str, timestamp_date, _ = output_path.stem.rsplit("_", 3)
+        assert date_str == timestamp_date
         assert output_path.suffix == ".json"
 
         # Verify content
-        import json
-
         with open(output_path) as f:
             loaded = json.load(f)
         assert loaded["metadata"]["developer"] == "Chad"
 
 
+def test_save_submission_is_atomic(tmp_path) -> None:
+    """Test a failed publish leaves neither the temp file nor a partial submission."""
+    with patch("hermod.collector.os.replace", side_effect=OSError("rename failed")):
+        with pytest.raises(OSError, match="rename failed"):
+            save_submission({"metadata": {}}, "Chad", output_dir=tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+
+    output_path = save_submission({"metadata": {}}, "Chad", output_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+def test_save_submission_overlapping_saves_use_separate_temp_files(tmp_path) -> None:
+    """Test a save that lands mid-way through another in the same second cannot clobber it."""
+    real_replace = os.replace
+    overlapped = False
+
+    def replace_after_overlapping_save(src, dst):
+        nonlocal overlapped
+        if not overlapped:
+            overlapped = True
+            save_submission({"metadata": {"save": 2}}, "Chad", output_dir=tmp_path)
+        real_replace(src, dst)
+
+    with (
+        patch("hermod.collector.datetime") as mock_datetime,
+        patch("hermod.collector.os.replace", side_effect=replace_after_overlapping_save),
+    ):
+        mock_datetime.now.return_value = datetime(2025, 1, 22, 10, 0, 0)
+        output_path = save_submission({"metadata": {"save": 1}}, "Chad", output_dir=tmp_path)
+
+    assert list(tmp_path.iterdir()) == [output_path]
+    assert json.loads(output_path.read_bytes()) == {"metadata": {"save": 1}}
+
+
 def test_run_command_validates_allowed_commands() -> None:
     """Test that only allowed commands can be run."""
     with pytest.raises(ValueError, match="Command not allowed"):
@@ -96,6 +181,8 @@ def test_run_command_validates_dangerous_arguments() -> None:
         ["ccusage", "daily", "& background-task"],
         ["ccusage", "daily", "$(malicious)"],
         ["ccusage", "daily", "`whoami`"],
+        ["ccusage", "daily", "> /tmp/out"],
+        ["ccusage", "daily", "--since\n20250101"],
     ]
 
     for cmd in dangerous_commands:
@@ -103,32 +190,32 @@ def test_run_command_validates_dangerous_arguments() -> None:
             run_command(cmd)
 
 
-def test_run_command_success() -> None:
+def test_run_command_success(mock_subprocess_run) -> None:
     """Test successful command execution."""
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.stdout = '{"daily": [], "totals": {}}'
-        mock_run.return_value = mock_result
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout=b'{"daily": [], "totals": {}}', returncode=0
+    )
 
-        result = run_command(["ccusage", "daily", "--json"])
+    result = run_command(["ccusage", "daily", "--json"])
 
-        assert result == {"daily": [], "totals": {}}
-        mock_run.assert_called_once()
-        # Verify timeout is set
-        assert mock_run.call_args[1]["timeout"] == DEFAULT_COMMAND_TIMEOUT_SECONDS
+    assert result == {"daily": [], "totals": {}}
+    mock_subprocess_run.assert_called_once()
+    # Verify timeout is set
+    assert mock_subprocess_run.call_args[1]["timeout"] == DEFAULT_COMMAND_TIMEOUT_SECONDS
+    # Output stays as bytes for the JSON parser; no text-mode decode
+    assert "text" not in mock_subprocess_run.call_args[1]
 
 
-def test_run_command_respects_explicit_timeout() -> None:
+def test_run_command_respects_explicit_timeout(mock_subprocess_run) -> None:
     """Test explicit timeout override is applied."""
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.stdout = '{"daily": [], "totals": {}}'
-        mock_run.return_value = mock_result
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout=b'{"daily": [], "totals": {}}', returncode=0
+    )
 
-        result = run_command(["ccusage", "daily"], timeout_seconds=300)
+    result = run_command(["ccusage", "daily"], timeout_seconds=300)
 
-        assert result == {"daily": [], "totals": {}}
-        assert mock_run.call_args[1]["timeout"] == 300
+    assert result == {"daily": [], "totals": {}}
+    assert mock_subprocess_run.call_args[1]["timeout"] == 300
 
 
 def test_resolve_command_timeout_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -165,46 +252,54 @@ def test_resolve_command_timeout_explicit_bounds() -> None:
     )
 
 
-def test_run_command_timeout() -> None:
+def test_resolve_command_timeout_env_is_cached_per_value(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test parsed env values are cached without hiding later changes."""
+    _resolve_env_timeout.cache_clear()
+    monkeypatch.setenv("HERMOD_COMMAND_TIMEOUT_SECONDS", "120")
+    assert resolve_command_timeout_seconds() == 120
+    assert resolve_command_timeout_seconds() == 120
+    assert _resolve_env_timeout.cache_info().hits == 1
+
+    monkeypatch.setenv("HERMOD_COMMAND_TIMEOUT_SECONDS", "240")
+    assert resolve_command_timeout_seconds() == 240
+
+
+def test_run_command_timeout(mock_subprocess_run) -> None:
     """Test command timeout handling."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = subprocess.TimeoutExpired("ccusage", DEFAULT_COMMAND_TIMEOUT_SECONDS)
+    mock_subprocess_run.side_effect = subprocess.TimeoutExpired(
+        "ccusage", DEFAULT_COMMAND_TIMEOUT_SECONDS
+    )
 
-        result = run_command(["ccusage", "daily"])
+    result = run_command(["ccusage", "daily"])
 
-        assert result == {}
+    assert result == {}
 
 
-def test_run_command_invalid_json() -> None:
+def test_run_command_invalid_json(mock_subprocess_run) -> None:
     """Test handling of invalid JSON response."""
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.stdout = "not valid json"
-        mock_run.return_value = mock_result
+    mock_subprocess_run.return_value = SimpleNamespace(stdout=b"not valid json", returncode=0)
 
-        result = run_command(["ccusage", "daily"])
+    result = run_command(["ccusage", "daily"])
 
-        assert result == {}
+    assert result == {}
 
 
-def test_run_command_non_dict_response() -> None:
+def test_run_command_non_dict_response(mock_subprocess_run) -> None:
     """Test validation rejects non-dict JSON responses."""
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.stdout = '["list", "not", "dict"]'
-        mock_run.return_value = mock_result
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout=b'["list", "not", "dict"]', returncode=0
+    )
 
-        with pytest.raises(ValueError, match="Expected dict response"):
-            run_command(["ccusage", "daily"])
+    with pytest.raises(ValueError, match="Expected dict response"):
+        run_command(["ccusage", "daily"])
 
 
-def test_run_command_called_process_error() -> None:
+def test_run_command_called_process_error(mock_subprocess_run) -> None:
     """Test handling of CalledProcessError (command failure)."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = subprocess.CalledProcessError(
-            returncode=1, cmd=["ccusage", "daily"], stderr="Command failed"
-        )
+    mock_subprocess_run.side_effect = subprocess.CalledProcessError(
+        returncode=1, cmd=["ccusage", "daily"], stderr="Command failed"
+    )
 
-        result = run_command(["ccusage", "daily"])
+    result = run_command(["ccusage", "daily"])
 
-        assert result == {}
+    assert result == {}
@@ -1,7 +1,10 @@
 """Tests for external dependency checking."""
 
+from collections.abc import Iterator
 from unittest.mock import patch
 
+import pytest
+
 from hermod.dependencies import (
     check_all_dependencies,
     check_ccusage_codex_installed,
@@ -9,45 +12,59 @@ from hermod.dependencies import (
 )
 
 
-def test_check_ccusage_installed_success() -> None:
-    """Test detecting installed ccusage."""
-    with patch("shutil.which", return_value="/usr/local/bin/ccusage"):
-        is_installed = check_ccusage_installed()
-        assert is_installed is True
+@pytest.fixture(autouse=True)
+def clear_dependency_caches() -> Iterator[None]:
+    """Reset cached dependency checks around each test."""
+    checks = (check_all_dependencies, check_ccusage_installed, check_ccusage_codex_installed)
+    for check in checks:
+        check.cache_clear()
+    yield
+    for check in checks:
+        check.cache_clear()
 
 
-def test_check_ccusage_installed_missing() -> None:
-    """Test detecting missing ccusage."""
-    with patch("shutil.which", return_value=None):
-        is_installed = check_ccusage_installed()
-        assert is_installed is False
+@pytest.mark.parametrize(
+    ("check", "which_return", "expected"),
+    [
+        (check_ccusage_installed, "/usr/local/bin/ccusage", True),
+        (check_ccusage_installed, None, False),
+        (check_ccusage_codex_installed, "/usr/local/bin/ccusage-codex", True),
+        (check_ccusage_codex_installed, None, False),
+    ],
+    ids=["ccusage-installed", "ccusage-missing", "codex-installed", "codex-missing"],
+)
+def test_check_tool_installed(
+    check, which_return, expected, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test detecting installed and missing tools on PATH."""
+    monkeypatch.setattr("shutil.which", lambda _: which_return)
 
+    assert check() is expected
 
-def test_check_all_dependencies_success() -> None:
-    """Test when all dependencies are installed."""
-    with patch("hermod.dependencies.check_ccusage_installed", return_value=True):
-        with patch("hermod.dependencies.check_ccusage_codex_installed", return_value=True):
-            result = check_all_dependencies()
-            assert result == {"ccusage": True, "ccusage-codex": True}
 
+@pytest.mark.parametrize("installed", [True, False], ids=["installed", "missing"])
+def test_check_all_dependencies(installed: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the combined report reflects each tool's check."""
+    monkeypatch.setattr("hermod.dependencies.check_ccusage_installed", lambda: installed)
+    monkeypatch.setattr("hermod.dependencies.check_ccusage_codex_installed", lambda: installed)
 
-def test_check_all_dependencies_missing() -> None:
-    """Test when dependencies are missing."""
-    with patch("hermod.dependencies.check_ccusage_installed", return_value=False):
-        with patch("hermod.dependencies.check_ccusage_codex_installed", return_value=False):
-            result = check_all_dependencies()
-            assert result == {"ccusage": False, "ccusage-codex": False}
+    assert check_all_dependencies() == {"ccusage": installed, "ccusage-codex": installed}
 
 
-def test_check_ccusage_codex_installed_success() -> None:
-    """Test detecting installed ccusage-codex."""
-    with patch("shutil.which", return_value="/usr/local/bin/ccusage-codex"):
-        is_installed = check_ccusage_codex_installed()
-        assert is_installed is True
+def test_check_all_dependencies_is_cached() -> None:
+    """Test repeated checks reuse the first PATH lookup."""
+    with patch("shutil.which", return_value="/usr/local/bin/tool") as mock_which:
+        first = check_all_dependencies()
+        second = check_all_dependencies()
 
+    assert first is second
+    assert mock_which.call_count == 2  # once per tool, not per call
 
-def test_check_ccusage_codex_installed_missing() -> None:
-    """Test detecting missing ccusage-codex."""
+
+def test_check_all_dependencies_result_is_read_only() -> None:
+    """Test the cached result cannot be mutated by callers."""
     with patch("shutil.which", return_value=None):
-        is_installed = check_ccusage_codex_installed()
-        assert is_installed is False
+        result = check_all_dependencies()
+
+    with pytest.raises(TypeError):
+        result["ccusage"] = True  # type: ignore[index]
@@ -1,40 +1,81 @@
 """Tests for git configuration detection."""
 
+import json
+import os
 import subprocess
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
-from hermod.git_detector import detect_developer, get_git_user_email
-
-
-def test_get_git_user_email_success() -> None:
+import hermod.git_detector as gd
+from hermod.git_detector import detect_developer, get_git_user_email, get_git_user_name
+
+
+@pytest.fixture(autouse=True)
+def isolated_git_config(tmp_path, monkeypatch):
+    """Keep git config file reads away from the host's real configuration."""
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(tmp_path / "gitconfig"))
+    for var in ("GIT_CONFIG_PARAMETERS", "GIT_CONFIG_COUNT", "GIT_DIR"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gd, "_git_identity", None)
+    monkeypatch.setattr(gd, "_git_cli_identity", None)
+    detect_developer.cache_clear()
+    yield tmp_path / "gitconfig"
+    detect_developer.cache_clear()
+
+
+# Written once per module; tests that modify a config build their own in tmp_path
+_DEVELOPER_NAMES = {
+    "developers": [
+        {
+            "canonical_name": "Alice",
+            "git_emails": ["alice@example.com"],
+            "git_names": ["Alice Smith"],
+            "linear_names": ["alice@linear.com", "Alice S."],
+        },
+    ]
+}
+
+
+@pytest.fixture(scope="module")
+def developer_names_config(tmp_path_factory):
+    """A developer_names.json shared by the tests that only read it."""
+    config_file = tmp_path_factory.mktemp("hermod_cfg") / "developer_names.json"
+    config_file.write_text(json.dumps(_DEVELOPER_NAMES))
+    return config_file
+
+
+def test_get_git_user_email_success(mock_subprocess_run) -> None:
     """Test extracting email from git config."""
-    with patch("subprocess.run") as mock_run:
-        mock_result = MagicMock()
-        mock_result.stdout = "chad@degreeanalytics.com\n"
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-
-        email = get_git_user_email()
-        assert email == "chad@degreeanalytics.com"
-        mock_run.assert_called_once_with(
-            ["git", "config", "user.email"], capture_output=True, text=True, check=True
-        )
-
-
-def test_get_git_user_email_not_configured() -> None:
+    # Output of `git config -z --get-regexp`: NUL-terminated "key\nvalue" records
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout="user.name\nChad Walters\0user.email\nchad@degreeanalytics.com\0", returncode=0
+    )
+
+    email = get_git_user_email()
+    assert email == "chad@degreeanalytics.com"
+    assert gd.get_git_user_name() == "Chad Walters"
+    mock_subprocess_run.assert_called_once_with(
+        ["git", "config", "-z", "--get-regexp", r"^user\.(email|name)$"],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=gd.GIT_COMMAND_TIMEOUT_SECONDS,
+        env=gd._git_env(),
+    )
+
+
+def test_get_git_user_email_not_configured(mock_subprocess_run) -> None:
     """Test handling when git email is not configured."""
-    import subprocess
-
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = subprocess.CalledProcessError(1, "git config")
+    mock_subprocess_run.side_effect = subprocess.CalledProcessError(1, "git config")
 
-        with pytest.raises(RuntimeError, match="Git user.email not configured"):
-            get_git_user_email()
+    with pytest.raises(RuntimeError, match="Git user.email not configured"):
+        get_git_user_email()
 
 
-def test_detect_developer_from_git_name() -> None:
+def test_detect_developer_from_git_name(mock_subprocess_run) -> None:
     """Test detecting canonical name from git name."""
     mock_mappings = {
         "email_to_canonical": {},
@@ -42,104 +83,121 @@ def test_detect_developer_from_git_name() -> None:
     }
     with patch("hermod.git_detector.load_developer_mappings", return_value=mock_mappings):
         with patch("hermod.git_detector.get_git_user_email", return_value="unknown@example.com"):
-            with patch("subprocess.run") as mock_run:
-                mock_result = MagicMock()
-                mock_result.stdout = "Chad Walters\n"
-                mock_result.returncode = 0
-                mock_run.return_value = mock_result
+            mock_subprocess_run.return_value = SimpleNamespace(
+                stdout="user.name\nChad Walters\0", returncode=0
+            )
 
-                developer = detect_developer()
-                assert developer == "Chad"
+            developer = detect_developer()
+            assert developer == "Chad"
 
 
-def test_detect_developer_from_email() -> None:
-    """Test detecting canonical name from git email."""
+@pytest.mark.parametrize("email", ["chad.walters@campusiq.com", "Chad.Walters@CampusIQ.com"])
+def test_detect_developer_from_email(email) -> None:
+    """Test detecting canonical name from git email, regardless of case."""
     mock_mappings = {
         "email_to_canonical": {"chad.walters@campusiq.com": "Chad"},
         "name_to_canonical": {},
     }
     with patch("hermod.git_detector.load_developer_mappings", return_value=mock_mappings):
-        with patch(
-            "hermod.git_detector.get_git_user_email", return_value="chad.walters@campusiq.com"
-        ):
+        with patch("hermod.git_detector.get_git_user_email", return_value=email):
             developer = detect_developer()
             assert developer == "Chad"
 
 
-def test_detect_developer_email_fallback() -> None:
+def test_detect_developer_email_fallback(caplog, mock_subprocess_run) -> None:
     """Test fallback when developer not found in mappings."""
     mock_mappings = {"email_to_canonical": {}, "name_to_canonical": {}}
     with patch("hermod.git_detector.load_developer_mappings", return_value=mock_mappings):
         with patch("hermod.git_detector.get_git_user_email", return_value="unknown@example.com"):
-            with patch("subprocess.run") as mock_run:
-                # Raise CalledProcessError (one of the specific exceptions handled)
-                mock_run.side_effect = subprocess.CalledProcessError(
-                    1, ["git", "config", "user.name"]
-                )
+            # Raise CalledProcessError (one of the specific exceptions handled)
+            mock_subprocess_run.side_effect = subprocess.CalledProcessError(
+                1, ["git", "config", "user.name"]
+            )
 
+            with caplog.at_level("WARNING", logger="hermod.git_detector"):
                 developer = detect_developer()
-                assert developer == "unknown"  # Email username fallback
+            assert developer == "unknown"  # Email username fallback
+            assert "Using email username as fallback: unknown." in caplog.text
 
 
 # === Additional coverage tests ===
 
 
-def test_get_git_user_name_timeout() -> None:
-    """Test handling when git user.name command times out."""
-    from hermod.git_detector import get_git_user_name
-
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="git config user.name", timeout=5)
+def test_get_git_user_fields_single_call(mock_subprocess_run) -> None:
+    """Test email and name come from one git invocation, with later entries winning."""
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout=(
+            "user.email\nhome@example.com\0user.name\nChad Walters\0user.email\nwork@example.com\0"
+        ),
+        returncode=0,
+    )
 
-        result = get_git_user_name()
-        assert result is None
+    assert get_git_user_email() == "work@example.com"
+    assert gd.get_git_user_name() == "Chad Walters"
+    mock_subprocess_run.assert_called_once()
 
 
-def test_get_git_user_name_git_not_found() -> None:
-    """Test handling when git is not installed."""
-    from hermod.git_detector import get_git_user_name
+def test_get_git_user_name_timeout(mock_subprocess_run) -> None:
+    """Test handling when git user.name command times out."""
+    mock_subprocess_run.side_effect = subprocess.TimeoutExpired(
+        cmd="git config user.name", timeout=5
+    )
 
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = FileNotFoundError("git not found")
+    result = get_git_user_name()
+    assert result is None
 
-        result = get_git_user_name()
-        assert result is None
 
+def test_get_git_user_name_git_not_found(mock_subprocess_run) -> None:
+    """Test handling when git is not installed."""
+    mock_subprocess_run.side_effect = FileNotFoundError("git not found")
 
-def test_load_developer_mappings_with_config_file(tmp_path, monkeypatch) -> None:
-    """Test loading developer mappings from config file."""
-    import json
-
-    import hermod.git_detector as gd
-
-    config_data = {
-        "developers": [
-            {
-                "canonical_name": "Alice",
-                "git_emails": ["alice@example.com"],
-                "git_names": ["Alice Smith"],
-                "linear_names": ["alice@linear.com"],
-            },
-        ]
-    }
+    result = get_git_user_name()
+    assert result is None
 
-    # Create directory structure matching the code's expectation
-    # Path(__file__).parent.parent.parent / "config" / "developer_names.json"
-    src_dir = tmp_path / "src" / "hermod"
-    src_dir.mkdir(parents=True)
-    config_dir = tmp_path / "config"
-    config_dir.mkdir()
-    config_file = config_dir / "developer_names.json"
-    config_file.write_text(json.dumps(config_data))
 
-    # Patch __file__ to our temp structure
-    monkeypatch.setattr(gd, "__file__", str(src_dir / "git_detector.py"))
+def test_load_developer_mappings_with_config_file(developer_names_config, monkeypatch) -> None:
+    """Test loading developer mappings from config file."""
+    monkeypatch.setattr(gd, "_CONFIG_PATH", developer_names_config)
 
     mappings = gd.load_developer_mappings()
 
     assert mappings["email_to_canonical"]["alice@example.com"] == "Alice"
     assert mappings["name_to_canonical"]["alice smith"] == "Alice"
     assert mappings["email_to_canonical"]["alice@linear.com"] == "Alice"
+    assert "alice s." not in mappings["email_to_canonical"]
+
+    # The cached mappings are shared, so callers cannot modify them
+    with pytest.raises(TypeError):
+        mappings["email_to_canonical"]["mallory@example.com"] = "Mallory"
+
+
+def test_load_developer_mappings_cached_until_config_changes(tmp_path, monkeypatch) -> None:
+    """Test parsed mappings are reused until the config file is modified."""
+    config_file = tmp_path / "developer_names.json"
+    config_file.write_text(
+        json.dumps({"developers": [{"canonical_name": "Alice", "git_names": ["Alice"]}]})
+    )
+    monkeypatch.setattr(gd, "_CONFIG_PATH", config_file)
+
+    first = gd.load_developer_mappings()
+    assert gd.load_developer_mappings() is first
+
+    config_file.write_text(
+        json.dumps({"developers": [{"canonical_name": "Bob", "git_names": ["Bob"]}]})
+    )
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    updated = gd.load_developer_mappings()
+    assert updated["name_to_canonical"] == {"bob": "Bob"}
+
+
+def test_detect_developer_from_config_file(developer_names_config, monkeypatch) -> None:
+    """Test detection resolves through the real config loader."""
+    monkeypatch.setattr(gd, "_CONFIG_PATH", developer_names_config)
+
+    with patch("hermod.git_detector.get_git_user_email", return_value="Alice@Example.com"):
+        assert detect_developer() == "Alice"
 
 
 def test_detect_developer_raises_when_no_valid_fallback() -> None:
@@ -151,3 +209,155 @@ def test_detect_developer_raises_when_no_valid_fallback() -> None:
             with patch("hermod.git_detector.get_git_user_name", return_value=None):
                 with pytest.raises(RuntimeError, match="Could not auto-detect developer"):
                     detect_developer()
+
+
+@pytest.mark.parametrize(
+    "config_text",
+    [
+        "# identity\n[core]\n\tautocrlf = input\n[user]\n\tname = Chad Walters\n"
+        "\temail = chad@degreeanalytics.com\n",
+        "[User]\n\tEmail = chad@degreeanalytics.com\n\tname = Chad Walters\n",
+        "[user]\n\temail = old@example.com\n\tname = Chad Walters\n"
+        "[core]\n\tbare = false\n[user]\n\temail = chad@degreeanalytics.com\n",
+        "[user]\n\temail = chad@degreeanalytics.com\n\tname = Chad \t Walters\n",
+    ],
+    ids=["plain", "case-variant", "repeated-section", "tab-in-value"],
+)
+def test_get_git_identity_from_config_file(
+    isolated_git_config, config_text, mock_subprocess_run
+) -> None:
+    """Test identity is read from the global config without spawning git."""
+    isolated_git_config.write_text(config_text)
+
+    assert get_git_user_email() == "chad@degreeanalytics.com"
+    assert gd.get_git_user_name() == "Chad Walters"
+    mock_subprocess_run.assert_not_called()
+
+
+def test_get_git_identity_local_repo_overrides_global(isolated_git_config, tmp_path) -> None:
+    """Test repository config takes precedence over the global config."""
+    isolated_git_config.write_text("[user]\n\temail = home@example.com\n\tname = Chad\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("[user]\n\temail = work@example.com\n")
+
+    assert get_git_user_email() == "work@example.com"
+    assert gd.get_git_user_name() == "Chad"
+
+
+def test_get_git_identity_is_cached(isolated_git_config) -> None:
+    """Test config files are only read once per process."""
+    isolated_git_config.write_text("[user]\n\temail = first@example.com\n")
+    assert get_git_user_email() == "first@example.com"
+
+    isolated_git_config.write_text("[user]\n\temail = second@example.com\n")
+    assert get_git_user_email() == "first@example.com"
+
+
+@pytest.mark.parametrize(
+    "config_text",
+    [
+        '[user]\n\temail = a@example.com\n[includeIf "gitdir:~/work/"]\n\tpath = work\n',
+        "[user]\n\temail = a@example.com\n[include]\n\tpath = extra\n",
+        "no section header\n",
+        '[user]\n\temail = a@example.com\n\tname = "Chad #1 Walters"\n',
+        "[user]\n\temail = a@example.com\n\tname = Chad Walters ; work\n",
+        '[user]\n\temail = a@example.com\n\tname = Chad \\"CW\\" Walters\n',
+        "[user]\n\temail = a@example.com\n\tname = Chad\\\nWalters\n",
+        '[user]\n\temail = a@example.com\n\tname = Al\n[user "work"]\n\tname = W\n',
+        "[DEFAULT]\n\temail = d@example.com\n[user]\n\tname = Al\n",
+        "[user]\n\temail = a@example.com\n[User]\n\temail = b@example.com\n",
+    ],
+    ids=[
+        "include-if",
+        "include",
+        "unparseable",
+        "quoted-hash",
+        "inline-comment",
+        "escaped-quote",
+        "line-continuation",
+        "user-subsection",
+        "default-section",
+        "mixed-case-user-sections",
+    ],
+)
+def test_get_git_identity_falls_back_to_git_cli(
+    isolated_git_config, config_text, mock_subprocess_run
+) -> None:
+    """Test configs this reader cannot mirror exactly defer to the git CLI."""
+    isolated_git_config.write_text(config_text)
+
+    mock_subprocess_run.return_value = SimpleNamespace(
+        stdout="user.email\ncli@example.com\0", returncode=0
+    )
+
+    assert get_git_user_email() == "cli@example.com"
+    mock_subprocess_run.assert_called_once()
+
+
+def test_get_git_identity_worktree_git_file_falls_back(isolated_git_config, tmp_path) -> None:
+    """Test a .git file (worktree or submodule) defers to the git CLI."""
+    isolated_git_config.write_text("[user]\n\temail = a@example.com\n")
+    (tmp_path / ".git").write_text("gitdir: /elsewhere/.git/worktrees/x\n")
+
+    assert gd._read_git_identity() == {}
+
+
+def test_git_config_files_env_override_falls_back(monkeypatch) -> None:
+    """Test command-line style config overrides defer to the git CLI."""
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+
+    assert gd._git_config_files() is None
+
+
+def test_git_config_files_default_locations(tmp_path, monkeypatch) -> None:
+    """Test XDG and home config files are used when GIT_CONFIG_GLOBAL is unset."""
+    monkeypatch.delenv("GIT_CONFIG_GLOBAL")
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "xdg"))
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+    assert gd._git_config_files() == [
+        tmp_path / "xdg" / "git" / "config",
+        tmp_path / "home" / ".gitconfig",
+    ]
+
+
+def test_detect_developer_is_cached() -> None:
+    """Test detection runs once per process and is reused afterwards."""
+    mock_mappings = {
+        "email_to_canonical": {"chad.walters@campusiq.com": "Chad"},
+        "name_to_canonical": {},
+    }
+    with patch(
+        "hermod.git_detector.load_developer_mappings", return_value=mock_mappings
+    ) as mock_load:
+        with patch(
+            "hermod.git_detector.get_git_user_email", return_value="chad.walters@campusiq.com"
+        ):
+            assert detect_developer() == "Chad"
+            assert detect_developer() == "Chad"
+
+    mock_load.assert_called_once()
+
+
+def test_load_developer_mappings_missing_config(tmp_path, monkeypatch) -> None:
+    """Test a missing config file yields empty mappings."""
+    monkeypatch.setattr(gd, "_CONFIG_PATH", tmp_path / "missing.json")
+
+    mappings = gd.load_developer_mappings()
+
+    assert mappings == {"email_to_canonical": {}, "name_to_canonical": {}}
+
+
+def test_git_env_keeps_only_git_relevant_variables(monkeypatch) -> None:
+    """Test git subprocesses get PATH, HOME and GIT_* but not unrelated variables."""
+    monkeypatch.setenv("PATH", "/usr/bin")
+    monkeypatch.setenv("HOME", "/home/dev")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", "/home/dev/.gitconfig-work")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+
+    env = gd._git_env()
+
+    assert env["PATH"] == "/usr/bin"
+    assert env["HOME"] == "/home/dev"
+    assert env["GIT_CONFIG_GLOBAL"] == "/home/dev/.gitconfig-work"
+    assert "AWS_SECRET_ACCESS_KEY" not in env
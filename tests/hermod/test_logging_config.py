@@ -1,9 +1,11 @@
 """Tests for logging configuration."""
 
 import logging
+import logging.handlers
 from pathlib import Path
 
-from hermod.logging_config import get_logger, setup_logging
+from hermod import logging_config
+from hermod.logging_config import _reset_logging, get_logger, setup_logging, shutdown_logging
 
 
 def test_setup_logging_with_log_file(tmp_path: Path) -> None:
@@ -20,9 +22,8 @@ def test_setup_logging_with_log_file(tmp_path: Path) -> None:
     logger.debug("Test debug message")
     logger.info("Test info message")
 
-    # Force flush by closing handlers
-    for handler in logging.getLogger().handlers:
-        handler.flush()
+    # Drain the queue so the background listener has written every record
+    shutdown_logging()
 
     assert log_file.exists()
     content = log_file.read_text()
@@ -101,3 +102,74 @@ def test_get_logger_returns_same_logger_for_same_name() -> None:
     logger2 = get_logger("same.name")
 
     assert logger1 is logger2
+
+
+def test_setup_logging_file_handler_runs_off_thread(tmp_path: Path) -> None:
+    """Test that file logging goes through a queue and the file opens lazily."""
+    log_file = tmp_path / "test.log"
+
+    setup_logging(level="DEBUG", log_file=log_file)
+
+    root_logger = logging.getLogger()
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers)
+    assert not any(isinstance(h, logging.FileHandler) for h in root_logger.handlers)
+    assert not log_file.exists()
+
+    logging.getLogger("test_logger").info("Queued message")
+    shutdown_logging()
+
+    assert log_file.read_text().endswith("Queued message\n")
+    # A second shutdown is a no-op
+    shutdown_logging()
+
+
+def test_setup_logging_same_config_is_noop() -> None:
+    """Test that repeating an identical configuration keeps the installed handlers."""
+    _reset_logging()
+    setup_logging(level="INFO")
+    handlers = list(logging.getLogger().handlers)
+
+    setup_logging(level="info")
+    assert logging.getLogger().handlers == handlers
+
+    setup_logging(level="DEBUG")
+    assert logging.getLogger().handlers != handlers
+
+    # A forced reset rebuilds even when the configuration is unchanged
+    handlers = list(logging.getLogger().handlers)
+    _reset_logging()
+    setup_logging(level="DEBUG")
+    assert logging.getLogger().handlers != handlers
+
+
+def test_setup_logging_restarts_stopped_file_listener(tmp_path: Path) -> None:
+    """Test that a configuration whose listener was shut down is rebuilt."""
+    log_file = tmp_path / "test.log"
+    setup_logging(level="DEBUG", log_file=log_file)
+    shutdown_logging()
+
+    setup_logging(level="DEBUG", log_file=log_file)
+    logging.getLogger("test_logger").info("After restart")
+    shutdown_logging()
+
+    assert "After restart" in log_file.read_text()
+
+
+def test_setup_logging_reuses_listener_for_same_file(tmp_path: Path) -> None:
+    """Test that changing only the level keeps the open log file and its listener."""
+    log_file = tmp_path / "test.log"
+    setup_logging(level="DEBUG", log_file=log_file)
+    listener = logging_config._listener
+    logging.getLogger("test_logger").info("Before")
+
+    setup_logging(level="INFO", log_file=log_file)
+    assert logging_config._listener is listener
+    logging.getLogger("test_logger").info("After")
+
+    setup_logging(level="INFO", log_file=tmp_path / "other.log")
+    assert logging_config._listener is not listener
+    shutdown_logging()
+
+    content = log_file.read_text()
+    assert "Before" in content
+    assert "After" in content
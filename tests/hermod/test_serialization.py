@@ -0,0 +1,61 @@
+"""Tests for JSON serialization helpers."""
+
+import importlib
+import json
+import subprocess
+import sys
+
+import pytest
+
+from hermod import serialization
+
+
+def test_loads_accepts_bytes_and_str() -> None:
+    """Test parsing from both bytes and str input."""
+    assert serialization.loads(b'{"daily": [], "totals": {}}') == {"daily": [], "totals": {}}
+    assert serialization.loads('{"daily": []}') == {"daily": []}
+
+
+def test_loads_invalid_json_raises() -> None:
+    """Test invalid JSON raises the stdlib-compatible error type."""
+    with pytest.raises(serialization.JSONDecodeError):
+        serialization.loads(b"not valid json")
+
+
+def test_dumps_compact_round_trip() -> None:
+    """Test compact output round-trips through the stdlib parser."""
+    data = {"metadata": {"developer": "Chad"}, "totals": {"totalCost": 1.5}}
+
+    encoded = serialization.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert b"\n" not in encoded
+    assert json.loads(encoded) == data
+
+
+def test_dumps_indent() -> None:
+    """Test indented output uses two-space indentation."""
+    encoded = serialization.dumps({"metadata": {"developer": "Chad"}}, indent=True)
+
+    assert encoded.splitlines()[1] == b'  "metadata": {'
+
+
+def test_stdlib_fallback_without_orjson(
+    monkeypatch: pytest.MonkeyPatch, mock_subprocess_run
+) -> None:
+    """Test helpers fall back to stdlib json when orjson is unavailable."""
+    # Scope the sys.modules patch so other fixtures' patches stay in place
+    try:
+        with monkeypatch.context() as mp:
+            mp.setitem(sys.modules, "orjson", None)
+            fallback = importlib.reload(serialization)
+            assert fallback.HAS_ORJSON is False
+            assert fallback.loads(b'{"a": 1}') == {"a": 1}
+            assert fallback.dumps({"a": 1}) == b'{"a":1}'
+            assert fallback.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+            with pytest.raises(fallback.JSONDecodeError):
+                fallback.loads("{{{")
+    finally:
+        importlib.reload(serialization)
+
+    assert subprocess.run is mock_subprocess_run